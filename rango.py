@@ -1,5 +1,5 @@
-import json
 import sqlite3
+import orjson
 from http.server import HTTPServer
 from urllib.parse import parse_qs, urlparse
 import asyncio
@@ -9,7 +9,6 @@ import time
 import os
 import signal
 import sys
-import re
 import platform
 from typing import Dict, Any, Optional
 import traceback
@@ -33,26 +32,15 @@ if not IS_WINDOWS:
         def load(self):
             return self.application
 
-class SimpleRouter:
-    def __init__(self):
-        self.routes = {}
+# UPDATE ... RETURNING needs SQLite 3.35+
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
 
-    def add_route(self, method: str, path: str, handler):
-        # Convert path parameters to regex pattern
-        pattern = re.sub(r'{([^/]+)}', r'(?P<\1>[^/]+)', path)
-        self.routes[(method, pattern)] = handler
-
-    def resolve(self, method: str, path: str):
-        for (route_method, pattern), handler in self.routes.items():
-            if method != route_method:
-                continue
-            match = re.match(f'^{pattern}$', path)
-            if match:
-                return handler, match.groupdict()
-        return None, None
+# Idle iter_select connections kept for reuse
+_STREAM_POOL_SIZE = 4
 
 class SimpleRequest:
     def __init__(self, request: web.Request):
+        self.request = request
         self.headers = request.headers
         self.method = request.method
         self.path = request.path
@@ -80,10 +68,38 @@ class SimpleRequest:
         parsed = parse_qs(query_string)
         return {k: v[0] if len(v) == 1 else v for k, v in parsed.items()}
 
+def _json_default(obj):
+    # Query results stay as sqlite3.Row until they are encoded
+    if isinstance(obj, sqlite3.Row):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(data):
+    return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
 class SimpleResponse:
     @staticmethod
     async def json(data: Any, status: int = 200, headers: Optional[Dict] = None):
-        return web.json_response(data, status=status, headers=headers)
+        return web.Response(body=_dumps(data), status=status, headers=headers,
+                            content_type='application/json')
+
+    @staticmethod
+    async def json_stream(req, key: str, batches, status: int = 200, headers: Optional[Dict] = None):
+        """Write {key: [...]} one batch of rows at a time instead of building the whole list"""
+        # Read the first batch before sending headers so query errors still get an error status
+        batches = iter(batches)
+        first = next(batches, None)
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_type = 'application/json'
+        await response.prepare(req.request)
+        await response.write(b'{' + _dumps(key) + b':[')
+        if first is not None:
+            await response.write(b','.join(_dumps(row) for row in first))
+            for batch in batches:
+                await response.write(b',' + b','.join(_dumps(row) for row in batch))
+        await response.write(b']}')
+        await response.write_eof()
+        return response
 
     @staticmethod
     async def text(text: str, status: int = 200, headers: Optional[Dict] = None):
@@ -92,47 +108,59 @@ class SimpleResponse:
 class ORM:
     def __init__(self, db_path: str = "database.db"):
         self.db_path = db_path
-        self._local = threading.local()
+        # Handlers call the ORM on the event loop thread, so one connection serves every query
+        self._connection = None
         self.lock = threading.Lock()
+        # Idle connections for iter_select, whose cursors stay open between batches
+        self._stream_pool = []
+        # Generated SQL keyed by table and column shape
+        self._insert_sql_cache = {}
+        self._update_sql_cache = {}
+
+    def _connect(self):
+        # Room for every distinct statement the app issues, so repeats skip SQLite's parser
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        # WAL lets other processes (e.g. gunicorn workers) read while this one commits
+        conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is durable in WAL mode except on power loss, and skips an fsync per commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")  # ~20MB page cache
+        return conn
 
     @property
     def connection(self):
-        if not hasattr(self._local, 'connection'):
-            self._local.connection = sqlite3.connect(self.db_path)
-            self._local.connection.row_factory = sqlite3.Row
-        return self._local.connection
-
-    @property
-    def cursor(self):
-        if not hasattr(self._local, 'cursor'):
-            self._local.cursor = self.connection.cursor()
-        return self._local.cursor
+        if self._connection is None:
+            self._connection = self._connect()
+        return self._connection
 
     def close(self):
-        if hasattr(self._local, 'connection'):
-            self._local.connection.close()
-            del self._local.connection
-        if hasattr(self._local, 'cursor'):
-            del self._local.cursor
+        with self.lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            stream_pool, self._stream_pool = self._stream_pool, []
+        for conn in stream_pool:
+            conn.close()
 
     def execute(self, query: str, params: tuple = ()):
-        try:
-            with self.lock:
-                self.cursor.execute(query, params)
+        with self.lock:
+            try:
+                self.connection.execute(query, params)
                 self.connection.commit()
-        except sqlite3.Error as e:
-            self.connection.rollback()
-            raise web.HTTPInternalServerError(text=str(e))
+            except sqlite3.Error as e:
+                self.connection.rollback()
+                raise web.HTTPInternalServerError(text=str(e))
 
     def fetchall(self, query, params=()):
         with self.lock:
-            self.cursor.execute(query, params)
-            return [dict(row) for row in self.cursor.fetchall()]
+            # Rows support row["col"] access and are converted to dicts only when encoded
+            return self.connection.execute(query, params).fetchall()
 
     def fetchone(self, query, params=()):
         with self.lock:
-            self.cursor.execute(query, params)
-            row = self.cursor.fetchone()
+            row = self.connection.execute(query, params).fetchone()
             return dict(row) if row else None
 
     def create_table(self, table_name, columns):
@@ -149,54 +177,99 @@ class ORM:
             data = [data]
             
         # Prepare the query for multiple inserts
-        columns = list(data[0].keys())
-        placeholders = ", ".join("?" * len(columns))
-        columns_str = ", ".join(columns)
+        columns = tuple(data[0].keys())
+        key = (table_name, columns)
+        query = self._insert_sql_cache.get(key)
+        if query is None:
+            placeholders = ", ".join("?" * len(columns))
+            columns_str = ", ".join(columns)
+            query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
+            self._insert_sql_cache[key] = query
         
-        query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
-        
-        # Execute for each row
-        try:
-            with self.lock:
-                for row in data:
-                    values = tuple(row[col] for col in columns)
-                    self.cursor.execute(query, values)
+        # Bind every row in C; sqlite3 opens one implicit transaction for the batch
+        with self.lock:
+            try:
+                self.connection.executemany(query, (tuple(row[col] for col in columns) for row in data))
                 self.connection.commit()
-        except sqlite3.Error as e:
-            self.connection.rollback()
-            raise web.HTTPBadRequest(text=f"Error inserting data: {str(e)}")
+            except sqlite3.Error as e:
+                self.connection.rollback()
+                raise web.HTTPBadRequest(text=f"Error inserting data: {str(e)}")
 
-    def update(self, table_name, data, where, params=()):
+    def update(self, table_name, data, where, params=(), returning=False):
+        """Update matching rows; with returning=True, return the updated rows"""
         if not data:
             return
             
         # Prepare SET clause
-        set_clause = ", ".join(f"{key} = ?" for key in data.keys())
+        use_returning = returning and _HAS_RETURNING
+        key = (table_name, tuple(data.keys()), where, use_returning)
+        query = self._update_sql_cache.get(key)
+        if query is None:
+            set_clause = ", ".join(f"{column} = ?" for column in data.keys())
+            query = f"UPDATE {table_name} SET {set_clause}"
+            if where:
+                query += f" WHERE {where}"
+            if use_returning:
+                query += " RETURNING *"
+            self._update_sql_cache[key] = query
         values = list(data.values()) + list(params)
-        
-        query = f"UPDATE {table_name} SET {set_clause}"
-        if where:
-            query += f" WHERE {where}"
             
-        try:
-            with self.lock:
-                self.cursor.execute(query, values)
+        with self.lock:
+            try:
+                cursor = self.connection.execute(query, values)
+                # RETURNING rows must be read before the statement can be committed
+                rows = cursor.fetchall() if use_returning else None
                 self.connection.commit()
-                if self.cursor.rowcount == 0:
-                    raise web.HTTPNotFound(text=f"No {table_name} found to update")
-        except sqlite3.Error as e:
-            self.connection.rollback()
-            raise web.HTTPBadRequest(text=f"Error updating data: {str(e)}")
+            except sqlite3.Error as e:
+                self.connection.rollback()
+                raise web.HTTPBadRequest(text=f"Error updating data: {str(e)}")
+        if (len(rows) if use_returning else cursor.rowcount) == 0:
+            raise web.HTTPNotFound(text=f"No {table_name} found to update")
+        if returning and not use_returning:
+            # Older SQLite: read the rows back in a second statement
+            rows = self.select(table_name, where=where, params=params)
+        return rows
 
     def select(self, table_name, columns="*", where=None, params=()):
+        return self.fetchall(self._select_sql(table_name, columns, where), params)
+
+    def iter_select(self, table_name, columns="*", where=None, params=(), batch_size=1000):
+        """Yield the selected rows in lists of at most batch_size"""
+        query = self._select_sql(table_name, columns, where)
+        # The cursor stays open while suspended, so it gets a connection of its own where
+        # a rollback on the shared one can't reset it
+        with self.lock:
+            conn = self._stream_pool.pop() if self._stream_pool else None
+        if conn is None:
+            conn = self._connect()
+        cursor = None
+        try:
+            cursor = conn.execute(query, params)
+            rows = cursor.fetchmany(batch_size)
+            while rows:
+                yield rows
+                rows = cursor.fetchmany(batch_size)
+        except sqlite3.Error as e:
+            raise web.HTTPInternalServerError(text=str(e))
+        finally:
+            if cursor is not None:
+                cursor.close()
+            with self.lock:
+                if len(self._stream_pool) < _STREAM_POOL_SIZE:
+                    self._stream_pool.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    @staticmethod
+    def _select_sql(table_name, columns, where):
         query = f"SELECT {columns} FROM {table_name}"
         if where:
             query += f" WHERE {where}"
-        return self.fetchall(query, params)
+        return query
 
 class App:
     def __init__(self, debug=True):
-        self.router = SimpleRouter()
         self.app = web.Application()
         self.orm = ORM()
         self.app.on_shutdown.append(self._cleanup)
@@ -209,15 +282,13 @@ class App:
         async def wrapped_handler(request):
             try:
                 simple_request = SimpleRequest(request)
-                handler_func, path_params = self.router.resolve(request.method, request.path)
-                
-                if not handler_func:
-                    raise web.HTTPNotFound()
-
-                simple_request.path_params = path_params
-                await simple_request.parse_body(request)
+                # aiohttp has already routed the request and captured the path parameters
+                simple_request.path_params = dict(request.match_info)
+                # GET, HEAD, DELETE and OPTIONS requests carry no body worth reading
+                if request.method in ('POST', 'PUT', 'PATCH'):
+                    await simple_request.parse_body(request)
                 
-                response = await handler_func(simple_request, SimpleResponse, self.orm)
+                response = await handler(simple_request, SimpleResponse, self.orm)
                 return response
             except web.HTTPException as http_ex:
                 # Always show HTTP exceptions (404, 400, etc)
@@ -238,7 +309,6 @@ class App:
                     }, status=500)
 
         self.app.router.add_route(method, path, wrapped_handler)
-        self.router.add_route(method, path, handler)
 
     def run(self, host="127.0.0.1", port=8000, production=False):
         if production and not self.debug:
@@ -272,25 +342,78 @@ class App:
         web.run_app(self.app, host=host, port=port, access_log=self.debug)
 
     def _enable_auto_reload(self):
-        def restart_on_file_change():
-            watched_files = {}
-            for root, _, files in os.walk("."):
-                for file in files:
-                    if file.endswith(".py"):
-                        filepath = os.path.join(root, file)
-                        watched_files[filepath] = os.path.getmtime(filepath)
-
-            while True:
-                time.sleep(1)
-                for filepath, last_modified in watched_files.items():
-                    if not os.path.exists(filepath):
-                        continue
-                    current_modified = os.path.getmtime(filepath)
-                    if current_modified != last_modified:
-                        print(f"File changed: {filepath}. Restarting server...")
-                        os.kill(os.getpid(), signal.SIGINT)
-
-        threading.Thread(target=restart_on_file_change, daemon=True).start()
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            # Polling still works where filesystem events are unavailable (e.g. network mounts)
+            threading.Thread(target=self._poll_for_changes, daemon=True).start()
+            return
+
+        class ReloadHandler(FileSystemEventHandler):
+            def __init__(self):
+                self._timer = None
+
+            def _schedule(self, filepath):
+                if not filepath.endswith(".py"):
+                    return
+                # Editors often emit several events per save, so debounce them
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(0.2, _restart, args=(filepath,))
+                self._timer.daemon = True
+                self._timer.start()
+
+            def on_modified(self, event):
+                self._schedule(event.src_path)
+
+            def on_created(self, event):
+                self._schedule(event.src_path)
+
+            def on_deleted(self, event):
+                self._schedule(event.src_path)
+
+            def on_moved(self, event):
+                self._schedule(event.dest_path)
+
+        observer = Observer()
+        observer.schedule(ReloadHandler(), ".", recursive=True)
+        observer.start()
+
+    def _poll_for_changes(self):
+        watched_files = _scan_mtimes(".")
+        while True:
+            time.sleep(1)
+            current_files = _scan_mtimes(".")
+            for filepath, current_modified in current_files.items():
+                if watched_files.get(filepath) != current_modified:
+                    _restart(filepath)
+                    break
+            watched_files = current_files
+
+def _scan_mtimes(path):
+    """Map each .py file under path to its mtime, with one stat per file"""
+    mtimes = {}
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        try:
+                            mtimes[entry.path] = entry.stat(follow_symlinks=False).st_mtime
+                        except OSError:
+                            # Removed between listing and stat
+                            continue
+        except OSError:
+            continue
+    return mtimes
+
+def _restart(filepath):
+    print(f"File changed: {filepath}. Restarting server...")
+    os.kill(os.getpid(), signal.SIGINT)
 
 # Example Usage
 if __name__ == "__main__":
@@ -339,12 +462,10 @@ if __name__ == "__main__":
             raise web.HTTPBadRequest(text=str(e))
 
     async def get_users(req, res, orm):
-        users = orm.select("users")
-        return await res.json({"users": users})
+        return await res.json_stream(req, "users", orm.iter_select("users"))
     
     async def get_products(req, res, orm):
-        products = orm.select("products")
-        return await res.json({"products": products})
+        return await res.json_stream(req, "products", orm.iter_select("products"))
 
     async def get_user(req, res, orm):
         user_id = req.path_params.get('id')
@@ -371,10 +492,8 @@ if __name__ == "__main__":
             except ValueError:
                 raise web.HTTPBadRequest(text="Invalid price value. Price must be a number")
         
-        orm.update("products", update_data, "id = ?", (product_id,))
-        
-        # Get updated product
-        updated_product = orm.fetchone("SELECT * FROM products WHERE id = ?", (product_id,))
+        # The updated row comes back from the UPDATE itself
+        updated_product = orm.update("products", update_data, "id = ?", (product_id,), returning=True)[0]
         return await res.json({
             "message": "Product updated successfully",
             "product": updated_product
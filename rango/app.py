@@ -1,17 +1,25 @@
 from aiohttp import web
+import asyncio
 import os
 import signal
 import threading
 import time
 import traceback
 import logging
+import logging.handlers
+import queue
 from .router import SimpleRouter
 from .orm import ORM
+from .request import SimpleRequest
+from .response import SimpleResponse, json_response
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Serialized once; debug is checked per error since it may change after routes are added
+_INTERNAL_ERROR_BODY = b'{"error": "Internal Server Error"}'
+
 class App:
     def __init__(self, debug=True):
         self.router = SimpleRouter()
@@ -27,7 +35,8 @@ class App:
         if self.debug:
             logging.getLogger('aiohttp.access').setLevel(logging.DEBUG)
         else:
-            logging.getLogger('aiohttp.access').setLevel(logging.INFO)
+            # Access logging is opt-in outside debug mode
+            logging.getLogger('aiohttp.access').setLevel(logging.WARNING)
 
     async def _cleanup(self, app):
         self.orm.close()
@@ -43,36 +52,32 @@ class App:
         return decorator
 
     def add_route(self, method: str, path: str, handler):
-        async def wrapped_handler(request):
+        # Bound as defaults so the per-request lookups are local
+        async def wrapped_handler(request, _SR=SimpleRequest, _Resp=SimpleResponse,
+                                  _HTTPException=web.HTTPException):
             try:
-                from .request import SimpleRequest
-                from .response import SimpleResponse
-                
-                simple_request = SimpleRequest(request)
-                simple_request.path_params = {}  # Initialize path params
-                
                 # Use the handler directly since we're already in the correct route
-                response = await handler(simple_request, SimpleResponse)
-                return response
-            except web.HTTPException:
+                return await handler(_SR(request), _Resp)
+            except _HTTPException:
                 raise
             except Exception as e:
                 if self.debug:
-                    error_details = {
-                        'error': str(e),
-                        'traceback': traceback.format_exc(),
-                        'type': e.__class__.__name__
-                    }
-                    return web.json_response(error_details, status=500)
-                else:
-                    return web.json_response({
-                        'error': 'Internal Server Error'
-                    }, status=500)
+                    return self._debug_error_response(e)
+                return web.Response(body=_INTERNAL_ERROR_BODY, status=500,
+                                    content_type='application/json')
 
         # Add route directly to aiohttp app
         self.app.router.add_route(method, path, wrapped_handler)
         logger.debug(f"Added route: {method} {path}")
 
+    def _debug_error_response(self, e):
+        error_details = {
+            'error': str(e),
+            'traceback': traceback.format_exc(),
+            'type': e.__class__.__name__
+        }
+        return json_response(error_details, status=500)
+
     def run(self, host="127.0.0.1", port=8000, production=False):
         if production and not self.debug:
             if os.name == 'nt':  # Windows
@@ -93,27 +98,114 @@ class App:
         else:
             print("Running development server with debug=False")
 
-        # Configure runner with proper logging
-        runner = web.AppRunner(self.app, access_log_class=web.AccessLogger)
-        return web.run_app(self.app, host=host, port=port, access_log=logger)
+        self._install_uvloop()
+        return web.run_app(
+            self.app, host=host, port=port,
+            backlog=2048, keepalive_timeout=75,
+            # No per-request log formatting unless debugging
+            access_log=self._queued_access_log() if self.debug else None,
+            access_log_format='%r %s %b %Tf'
+        )
+
+    def _queued_access_log(self):
+        """Access logger whose records are written out by a background thread"""
+        access_logger = logging.getLogger(f'{__name__}.access')
+        if not access_logger.handlers:
+            log_queue = queue.SimpleQueue()
+            handlers = logging.getLogger().handlers or [logging.StreamHandler()]
+            listener = logging.handlers.QueueListener(log_queue, *handlers,
+                                                      respect_handler_level=True)
+            listener.start()
+
+            async def stop_listener(app):
+                listener.stop()
+                access_logger.removeHandler(queue_handler)
+
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            access_logger.addHandler(queue_handler)
+            access_logger.propagate = False
+            self.app.on_cleanup.append(stop_listener)
+        return access_logger
+
+    def _install_uvloop(self):
+        try:
+            import uvloop
+        except ImportError:
+            return
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
     def _enable_auto_reload(self):
-        def restart_on_file_change():
-            watched_files = {}
-            for root, _, files in os.walk("."):
-                for file in files:
-                    if file.endswith(".py"):
-                        filepath = os.path.join(root, file)
-                        watched_files[filepath] = os.path.getmtime(filepath)
-
-            while True:
-                time.sleep(1)
-                for filepath, last_modified in watched_files.items():
-                    if not os.path.exists(filepath):
-                        continue
-                    current_modified = os.path.getmtime(filepath)
-                    if current_modified != last_modified:
-                        print(f"File changed: {filepath}. Restarting server...")
-                        os.kill(os.getpid(), signal.SIGINT)
-
-        threading.Thread(target=restart_on_file_change, daemon=True).start() 
\ No newline at end of file
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            # Polling still works where filesystem events are unavailable (e.g. network mounts)
+            threading.Thread(target=self._poll_for_changes, daemon=True).start()
+            return
+
+        class ReloadHandler(FileSystemEventHandler):
+            def __init__(self):
+                self._timer = None
+
+            def _schedule(self, filepath):
+                if not filepath.endswith(".py"):
+                    return
+                # Editors often emit several events per save, so debounce them
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(0.2, _restart, args=(filepath,))
+                self._timer.daemon = True
+                self._timer.start()
+
+            def on_modified(self, event):
+                self._schedule(event.src_path)
+
+            def on_created(self, event):
+                self._schedule(event.src_path)
+
+            def on_deleted(self, event):
+                self._schedule(event.src_path)
+
+            def on_moved(self, event):
+                self._schedule(event.dest_path)
+
+        observer = Observer()
+        observer.schedule(ReloadHandler(), ".", recursive=True)
+        observer.start()
+
+    def _poll_for_changes(self):
+        watched_files = _scan_mtimes(".")
+        while True:
+            time.sleep(1)
+            current_files = _scan_mtimes(".")
+            for filepath, current_modified in current_files.items():
+                if watched_files.get(filepath) != current_modified:
+                    _restart(filepath)
+                    break
+            watched_files = current_files
+
+
+def _scan_mtimes(path):
+    """Map each .py file under path to its mtime, with one stat per file"""
+    mtimes = {}
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        try:
+                            mtimes[entry.path] = entry.stat(follow_symlinks=False).st_mtime
+                        except OSError:
+                            # Removed between listing and stat
+                            continue
+        except OSError:
+            continue
+    return mtimes
+
+
+def _restart(filepath):
+    print(f"File changed: {filepath}. Restarting server...")
+    os.kill(os.getpid(), signal.SIGINT)
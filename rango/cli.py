@@ -1,8 +1,5 @@
 import click
 import os
-import shutil
-from pathlib import Path
-import pkg_resources
 import logging
 import sys
 
@@ -16,12 +13,17 @@ logger = logging.getLogger(__name__)
 def get_template_dir():
     """Get the template directory with fallback options"""
     try:
-        template_dir = pkg_resources.resource_filename('rango', 'templates')
-        logger.debug(f"Template directory from pkg_resources: {template_dir}")
+        # Stdlib and lazy, unlike pkg_resources which scans every installed distribution
+        from importlib.resources import files
+        template_dir = str(files('rango') / 'templates')
+        logger.debug(f"Template directory from importlib.resources: {template_dir}")
         if os.path.exists(template_dir):
             return template_dir
+    except ImportError:
+        # importlib.resources.files needs Python 3.9+
+        pass
     except Exception as e:
-        logger.warning(f"Error getting template dir from pkg_resources: {e}")
+        logger.warning(f"Error getting template dir from importlib.resources: {e}")
 
     # Fallback to direct path
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -42,6 +44,10 @@ def cli():
 @click.argument('project_name')
 def startproject(project_name):
     """Create a new Rango project"""
+    # Only needed here, so other commands and --help don't pay for the imports
+    import shutil
+    from pathlib import Path
+
     logger.debug(f"Starting project creation: {project_name}")
     logger.debug(f"Current working directory: {os.getcwd()}")
     
@@ -54,33 +60,13 @@ def startproject(project_name):
             click.echo(f"Error: Directory '{project_name}' already exists", err=True)
             return
 
-        # Create directories
-        project_dir.mkdir()
-        (project_dir / 'app').mkdir()
-        (project_dir / 'static').mkdir()
-        (project_dir / 'templates').mkdir()
-        (project_dir / 'tests').mkdir()
-        
-        # Copy template files
-        template_files = {
-            'manage.py': project_dir / 'manage.py',
-            'requirements.txt': project_dir / 'requirements.txt',
-            'app/__init__.py': project_dir / 'app' / '__init__.py',
-            'app/routes.py': project_dir / 'app' / 'routes.py',
-            'app/models.py': project_dir / 'app' / 'models.py',
-            'app/settings.py': project_dir / 'app' / 'settings.py',
-        }
-
         logger.debug(f"Template directory contents: {os.listdir(TEMPLATE_DIR)}")
-        
-        for template, dest in template_files.items():
-            template_path = Path(TEMPLATE_DIR) / template
-            logger.debug(f"Copying {template_path} to {dest}")
-            if template_path.exists():
-                shutil.copy2(template_path, dest)
-            else:
-                logger.warning(f"Template not found: {template_path}")
-                dest.touch()
+
+        # Copy the whole template tree in one pass; this also creates project_dir and app/
+        shutil.copytree(TEMPLATE_DIR, project_dir,
+                        ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
+        for name in ('static', 'templates', 'tests'):
+            (project_dir / name).mkdir(exist_ok=True)
 
         # Make manage.py executable
         os.chmod(project_dir / 'manage.py', 0o755)
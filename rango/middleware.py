@@ -1,18 +1,29 @@
+from types import MappingProxyType
 from aiohttp import web
 from typing import Callable, Dict, Any
 
+# Built once and applied with a single update per response
+_CORS = MappingProxyType({
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type'
+})
+
 class Middleware:
     def __init__(self, app):
         self.app = app
 
+    @web.middleware
     async def session(self, request, handler):
         request['session'] = {}  # Simple session implementation
         response = await handler(request)
         return response
 
+    @web.middleware
     async def cors(self, request, handler):
+        if request.method == 'OPTIONS' and 'Access-Control-Request-Method' in request.headers:
+            # Answer CORS preflights without running the handler; other OPTIONS requests are routed
+            return web.Response(status=204, headers=_CORS)
         response = await handler(request)
-        response.headers['Access-Control-Allow-Origin'] = '*'
-        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
-        return response 
\ No newline at end of file
+        response.headers.update(_CORS)
+        return response
\ No newline at end of file
@@ -1,19 +1,49 @@
+import asyncio
 import sqlite3
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from typing import Dict, Any, List, Optional, Union, Tuple
 from aiohttp import web
 
+# Upper bound on per-ORM caches keyed by SQL text, and on sqlite3's statement cache
+_CACHE_SIZE = 256
+
 class ORM:
-    def __init__(self, db_path: str = "database.db"):
+    def __init__(self, db_path: str = "database.db", max_workers: int = 4):
         self.db_path = db_path
+        self.max_workers = max_workers
         self._local = threading.local()
-        self.lock = threading.Lock()
+        self._executor = None
+        # Every per-thread connection, so close() can reach those opened by worker threads
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # Idle connections kept for iter_rows, whose cursors outlive a single worker call
+        self._stream_pool: List[sqlite3.Connection] = []
+        self._sql_cache: Dict[tuple, str] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; writers take the lock explicitly via transaction().
+        # timeout is SQLite's busy timeout, so concurrent writers wait in C.
+        conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None,
+                               check_same_thread=False, cached_statements=_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers run alongside a writer instead of queueing on a Python lock
+        conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is durable in WAL mode except on power loss, and skips an fsync per commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # map up to 256MB of the file instead of pread
+        return conn
 
     @property
     def connection(self):
         if not hasattr(self._local, 'connection'):
-            self._local.connection = sqlite3.connect(self.db_path)
-            self._local.connection.row_factory = sqlite3.Row
+            conn = self._connect()
+            with self._connections_lock:
+                self._connections.append(conn)
+            self._local.connection = conn
         return self._local.connection
 
     @property
@@ -23,77 +53,200 @@ class ORM:
         return self._local.cursor
 
     def close(self):
-        if hasattr(self._local, 'connection'):
-            self._local.connection.close()
-            del self._local.connection
-        if hasattr(self._local, 'cursor'):
-            del self._local.cursor
+        # Let queued calls finish before their connections go away
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._stream_pool = []
+        for conn in connections:
+            conn.close()
+        # Fresh thread-local state, so any thread that uses the ORM again reconnects
+        self._local = threading.local()
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking ORM call in a worker thread so the event loop stays free
+
+        Each worker thread keeps its own connection, e.g.
+        ``users = await db.run(db.query, "SELECT * FROM users")``
+        """
+        if getattr(self._local, 'in_txn', False):
+            # The worker's connection is outside this thread's transaction and would
+            # wait on its write lock; use run_in_transaction instead
+            raise RuntimeError("ORM.run() cannot be called inside transaction()")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='rango-orm')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def run_in_transaction(self, func, *args, **kwargs):
+        """Run func inside transaction() on a worker thread, e.g.
+        ``await db.run_in_transaction(db.insert, "users", rows)``
+        """
+        return await self.run(self._call_in_transaction, partial(func, *args, **kwargs))
+
+    def _call_in_transaction(self, func):
+        with self.transaction():
+            return func()
+
+    async def iter_rows(self, query: str, params: tuple = (), batch_size: int = 1000):
+        """Yield lists of sqlite3.Row, fetching each batch in a worker thread
+
+        Successive batches may run on different workers, so the cursor lives on a
+        pooled streaming connection rather than a per-thread one, e.g.
+        ``async for rows in db.iter_rows("SELECT * FROM users"): ...``
+        """
+        with self._connections_lock:
+            conn = self._stream_pool.pop() if self._stream_pool else None
+        if conn is None:
+            conn = await self.run(self._connect)
+            with self._connections_lock:
+                self._connections.append(conn)
+        cursor = None
+        try:
+            # Run the query and read the first batch in one worker call
+            cursor, rows = await self.run(self._start_stream, conn, query, params, batch_size)
+            while rows:
+                yield rows
+                if len(rows) < batch_size:
+                    # A short batch is the last one; skip the round trip that would return []
+                    break
+                rows = await self.run(cursor.fetchmany, batch_size)
+        except sqlite3.Error as e:
+            raise web.HTTPInternalServerError(text=str(e))
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self._release_stream_connection(conn)
+
+    @staticmethod
+    def _start_stream(conn: sqlite3.Connection, query: str, params: tuple, batch_size: int):
+        cursor = conn.execute(query, params)
+        return cursor, cursor.fetchmany(batch_size)
+
+    def _release_stream_connection(self, conn: sqlite3.Connection):
+        with self._connections_lock:
+            if conn not in self._connections:
+                # close() ran while the stream was open and has already closed it
+                return
+            if len(self._stream_pool) < self.max_workers:
+                self._stream_pool.append(conn)
+                return
+            self._connections.remove(conn)
+        conn.close()
 
     def is_connected(self) -> bool:
         try:
-            self.cursor.execute("SELECT 1")
+            # A throwaway cursor leaves the shared one's lastrowid/rowcount untouched
+            self.connection.execute("SELECT 1")
             return True
         except (sqlite3.Error, AttributeError):
             return False
 
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed statements in one transaction with a single commit
+
+        The transaction belongs to the calling thread's connection, so ORM.run()
+        raises inside it. Use run_in_transaction() to run a transaction from async code.
+        """
+        if getattr(self._local, 'in_txn', False):
+            # Nested blocks join the outer transaction
+            yield self
+            return
+        self.connection.execute("BEGIN IMMEDIATE")
+        self._local.in_txn = True
+        try:
+            yield self
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.in_txn = False
+
     def execute(self, query: str, params: Union[tuple, List[tuple]] = ()) -> sqlite3.Cursor:
         """Execute a query and return the cursor"""
+        if isinstance(params, list) and len(params) > 0:
+            # Bulk operation
+            return self.executemany(query, params)
+        return self._execute(self.cursor.execute, query, params)
+
+    def executemany(self, query: str, params: List[tuple]) -> sqlite3.Cursor:
+        """Execute a query for every parameter tuple and commit once"""
+        # Without an explicit transaction autocommit would commit every row
+        with self.transaction():
+            return self._execute(self.cursor.executemany, query, params)
+
+    def _execute(self, method, query, params) -> sqlite3.Cursor:
         try:
-            with self.lock:
-                if isinstance(params, list) and len(params) > 0:
-                    # Bulk operation
-                    self.cursor.executemany(query, params)
-                else:
-                    # Single operation
-                    self.cursor.execute(query, params)
-                self.connection.commit()
-                return self.cursor
+            method(query, params)
+            return self.cursor
         except sqlite3.Error as e:
-            self.connection.rollback()
+            # Autocommit statements are atomic; transaction() rolls back on exit
             raise web.HTTPInternalServerError(text=str(e))
 
     def query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """Execute a query and return results as list of dictionaries"""
         cursor = self.execute(query, params)
-        columns = [col[0] for col in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        # Rows are sqlite3.Row, which carry their own column names
+        return [dict(row) for row in cursor.fetchall()]
 
     def get_one(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
         """Execute a query and return one result as dictionary"""
         cursor = self.execute(query, params)
         row = cursor.fetchone()
         if row:
-            columns = [col[0] for col in cursor.description]
-            return dict(zip(columns, row))
+            return dict(row)
         return None
 
+    def _cached_sql(self, key: tuple, build) -> str:
+        """Return generated SQL for key, building it only on first use"""
+        query = self._sql_cache.get(key)
+        if query is None:
+            if len(self._sql_cache) >= _CACHE_SIZE:
+                self._sql_cache.clear()
+            query = self._sql_cache[key] = build()
+        return query
+
+    def _insert_sql(self, table: str, columns: Tuple[str, ...]) -> str:
+        def build():
+            placeholders = ','.join(['?' for _ in columns])
+            return f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})"
+        return self._cached_sql(('INSERT', table, columns), build)
+
     def insert(self, table: str, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> int:
         """Insert one or multiple records and return last inserted id"""
         if not data:
             raise ValueError("No data provided for insert")
 
         if isinstance(data, list):
-            # Bulk insert
-            if not data[0]:
-                raise ValueError("Empty data in bulk insert")
-            columns = data[0].keys()
-            placeholders = ','.join(['?' for _ in columns])
-            query = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})"
-            values = [tuple(item[col] for col in columns) for item in data]
-            self.execute(query, values)
-        else:
-            # Single insert
-            columns = data.keys()
-            placeholders = ','.join(['?' for _ in columns])
-            query = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})"
-            self.execute(query, tuple(data.values()))
+            return self.insert_many(table, data)
 
+        # Single insert
+        self.execute(self._insert_sql(table, tuple(data)), tuple(data.values()))
         return self.cursor.lastrowid
 
+    def insert_many(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows sharing the first row's columns in one transaction and return the last id"""
+        if not rows or not rows[0]:
+            raise ValueError("Empty data in bulk insert")
+        columns = tuple(rows[0])
+        values = [tuple(row[col] for col in columns) for row in rows]
+        # executemany runs the batch inside a single BEGIN/COMMIT
+        self.executemany(self._insert_sql(table, columns), values)
+        # cursor.lastrowid is not updated by executemany
+        return self.connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+
     def update(self, table: str, data: Dict[str, Any], where: str, params: tuple = ()) -> int:
         """Update records and return number of affected rows"""
-        set_clause = ','.join([f"{k}=?" for k in data.keys()])
-        query = f"UPDATE {table} SET {set_clause} WHERE {where}"
+        columns = tuple(data)
+        def build():
+            set_clause = ','.join([f"{k}=?" for k in columns])
+            return f"UPDATE {table} SET {set_clause} WHERE {where}"
+        query = self._cached_sql(('UPDATE', table, columns, where), build)
         values = tuple(data.values()) + params
         self.execute(query, values)
         return self.cursor.rowcount
@@ -104,11 +257,16 @@ class ORM:
         self.execute(query, params)
         return self.cursor.rowcount
 
-    def create_table(self, table_name: str, columns: Dict[str, str]):
-        """Create a table if it doesn't exist"""
+    def create_table(self, table_name: str, columns: Dict[str, str], indexes: Optional[List[str]] = None):
+        """Create a table, plus an index on each of the given columns, if they don't exist"""
         columns_definition = ", ".join(f"{col} {dtype}" for col, dtype in columns.items())
         query = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_definition})"
         self.execute(query)
+        # UNIQUE and PRIMARY KEY columns are indexed by SQLite already
+        for column in indexes or ():
+            self.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table_name}_{column} ON {table_name} ({column})"
+            )
 
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists"""
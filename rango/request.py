@@ -1,24 +1,72 @@
 from typing import Dict, Any, Optional
-from urllib.parse import parse_qs
+from urllib.parse import parse_qs, unquote_plus
 from aiohttp import web
+from orjson import loads as _loads
+
+# Distinguishes "not decoded yet" from a JSON body that decoded to null
+_UNPARSED = object()
+
+def _fast_parse_qs(query_string: str) -> Dict[str, Any]:
+    """Parse a query string in one pass, keeping a list only for repeated keys"""
+    params = {}
+    if not query_string:
+        return params
+    for part in query_string.split('&'):
+        name, _, value = part.partition('=')
+        if not value:
+            # Like parse_qs, drop blank values and bare names
+            continue
+        name = unquote_plus(name)
+        value = unquote_plus(value)
+        if name not in params:
+            params[name] = value
+        elif isinstance(params[name], list):
+            params[name].append(value)
+        else:
+            params[name] = [params[name], value]
+    return params
 
 class SimpleRequest:
+    # One wrapper is built per request; slots avoid allocating an instance __dict__
+    __slots__ = ('_request', 'body', 'path_params', '_json_data', '_query_params')
+
     def __init__(self, request: web.Request):
         self._request = request  # Store the original request
-        self.headers = request.headers
-        self.method = request.method
-        self.path = request.path
-        self.query_params = self._parse_query_params(request.rel_url.query_string)
         self.body = None
-        self.path_params = {}
-        self._json_data = None
+        self.path_params = dict(request.match_info)
+        self._json_data = _UNPARSED
+        self._query_params = None
+
+    @property
+    def request(self) -> web.Request:
+        """The underlying aiohttp request"""
+        return self._request
+
+    @property
+    def headers(self):
+        return self._request.headers
+
+    @property
+    def method(self) -> str:
+        return self._request.method
+
+    @property
+    def path(self) -> str:
+        return self._request.path
+
+    @property
+    def query_params(self) -> Dict[str, Any]:
+        """Query string parameters, parsed on first access"""
+        if self._query_params is None:
+            self._query_params = _fast_parse_qs(self._request.rel_url.query_string)
+        return self._query_params
 
     async def parse_body(self, request: web.Request):
         content_type = request.headers.get('Content-Type', '')
         
         try:
             if 'application/json' in content_type:
-                self.body = await request.json()
+                self.body = _loads(await request.read())
                 self._json_data = self.body
             elif 'application/x-www-form-urlencoded' in content_type:
                 raw_data = await request.text()
@@ -32,17 +80,15 @@ class SimpleRequest:
 
     async def json(self) -> Optional[Dict[str, Any]]:
         """Get JSON data from the request"""
-        if self._json_data is None:
+        if self._json_data is _UNPARSED:
             try:
-                self._json_data = await self._request.json()
+                # A body already read as text is decoded from memory
+                raw = self.body if isinstance(self.body, str) else await self._request.read()
+                self._json_data = _loads(raw)
             except Exception:
                 raise web.HTTPBadRequest(text="Invalid JSON data")
         return self._json_data
 
-    def _parse_query_params(self, query_string: str) -> Dict[str, Any]:
-        parsed = parse_qs(query_string)
-        return {k: v[0] if len(v) == 1 else v for k, v in parsed.items()}
-
     @property
     def form(self) -> Dict[str, Any]:
         """Get form data from the request"""
@@ -1,18 +1,64 @@
+import sqlite3
+import orjson
 from typing import Any, Dict, Optional
 from aiohttp import web
 
+
+def _default(obj: Any) -> Any:
+    """Convert objects the JSON encoder doesn't handle natively"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if isinstance(obj, sqlite3.Row):
+        return dict(obj)
+    # Fail loudly rather than dumping an arbitrary object's __dict__ to the client
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(data: Any) -> bytes:
+    return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_response(data: Any, status: int = 200, headers: Optional[Dict] = None) -> web.Response:
+    """Build a JSON response, serializing straight to bytes"""
+    return web.Response(body=_dumps(data), status=status, headers=headers,
+                        content_type='application/json')
+
+
+_HTML_HEADERS = {'Content-Type': 'text/html'}
+
+
 class SimpleResponse:
     @staticmethod
-    async def json(data: Any, status: int = 200, headers: Optional[Dict] = None):
-        return web.json_response(data, status=status, headers=headers)
+    async def json(data: Any, status: int = 200, headers: Optional[Dict] = None) -> web.Response:
+        return json_response(data, status=status, headers=headers)
+
+    @staticmethod
+    async def json_stream(req, key: str, batches, status: int = 200,
+                          headers: Optional[Dict] = None) -> web.StreamResponse:
+        """Write {key: [...]} as each batch of rows arrives from an async iterator"""
+        # Fetch the first batch before sending headers so query errors still get an error status
+        batches = batches.__aiter__()
+        try:
+            first = await batches.__anext__()
+        except StopAsyncIteration:
+            first = None
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_type = 'application/json'
+        await response.prepare(req.request)
+        await response.write(b'{' + _dumps(key) + b':[')
+        if first is not None:
+            await response.write(b','.join(_dumps(row) for row in first))
+            async for batch in batches:
+                await response.write(b',' + b','.join(_dumps(row) for row in batch))
+        await response.write(b']}')
+        await response.write_eof()
+        return response
 
     @staticmethod
-    async def text(text: str, status: int = 200, headers: Optional[Dict] = None):
+    async def text(text: str, status: int = 200, headers: Optional[Dict] = None) -> web.Response:
         return web.Response(text=text, status=status, headers=headers)
 
     @staticmethod
-    async def html(html: str, status: int = 200, headers: Optional[Dict] = None):
-        if headers is None:
-            headers = {}
-        headers['Content-Type'] = 'text/html'
-        return web.Response(text=html, status=status, headers=headers) 
\ No newline at end of file
+    async def html(html: str, status: int = 200, headers: Optional[Dict] = None) -> web.Response:
+        headers = _HTML_HEADERS if headers is None else {**headers, 'Content-Type': 'text/html'}
+        return web.Response(text=html, status=status, headers=headers)
\ No newline at end of file
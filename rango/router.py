@@ -1,20 +1,86 @@
 import re
+from functools import lru_cache
 from typing import Tuple, Dict, Any, Optional, Callable
 
+# Matches a {param} placeholder in a route path
+_ROUTE_PARAM_RE = re.compile(r'{([^/]+)}')
+
+# Returned for routes without parameters; callers must not mutate it
+_EMPTY_PARAMS: Dict[str, str] = {}
+
+@lru_cache(maxsize=4096)
+def _compile_path(path: str):
+    """Compile a route path to its regex and parameter names, shared across routers"""
+    pattern = _ROUTE_PARAM_RE.sub(r'(?P<\1>[^/]+)', path)
+    return re.compile(f'^{pattern}$'), tuple(_ROUTE_PARAM_RE.findall(path))
+
 class SimpleRouter:
     def __init__(self):
-        self.routes = {}
+        # (method, path) -> handler for paths without parameters
+        self.static = {}
+        # (method, prefix) -> routes sharing the literal prefix before the first parameter
+        self.dynamic_by_prefix = {}
+        self.compiled = {}
 
     def add_route(self, method: str, path: str, handler: Callable):
+        if '{' not in path:
+            self.static[(method, path)] = handler
+            return
+
         # Convert path parameters to regex pattern
-        pattern = re.sub(r'{([^/]+)}', r'(?P<\1>[^/]+)', path)
-        self.routes[(method, pattern)] = handler
+        compiled, param_names = _compile_path(path)
+        entry = (compiled, handler, param_names)
+
+        # Parameters never span a '/', so bucket on the last one before the first parameter
+        key = (method, path[:path.rfind('/', 0, path.index('{')) + 1])
+        routes = self.dynamic_by_prefix.setdefault(key, [])
+        for i, (compiled, _, _) in enumerate(routes):
+            if compiled.pattern == entry[0].pattern:
+                routes[i] = entry
+                break
+        else:
+            routes.append(entry)
+
+        # The combined pattern for this bucket is rebuilt on the next resolve
+        self.compiled.pop(key, None)
+
+    def _compile(self, key: Tuple[str, str]):
+        """Build one alternation matching every route in a prefix bucket"""
+        routes = self.dynamic_by_prefix[key]
+        alternatives = []
+        for i, (compiled, _, param_names) in enumerate(routes):
+            # Group names must be unique across the alternation
+            inner = compiled.pattern[1:-1]
+            for name in param_names:
+                inner = inner.replace(f'(?P<{name}>', f'(?P<__r{i}_{name}>', 1)
+            alternatives.append(f'(?P<__r{i}>{inner})')
+
+        combined = re.compile('|'.join(alternatives))
+        groups = combined.groupindex
+        lookup = {}
+        for i, (_, handler, param_names) in enumerate(routes):
+            params = [(name, groups[f'__r{i}_{name}']) for name in param_names]
+            lookup[groups[f'__r{i}']] = (handler, params)
+
+        self.compiled[key] = (combined, lookup)
+        return self.compiled[key]
 
     def resolve(self, method: str, path: str) -> Tuple[Optional[Callable], Dict[str, str]]:
-        for (route_method, pattern), handler in self.routes.items():
-            if method != route_method:
+        handler = self.static.get((method, path))
+        if handler is not None:
+            return handler, _EMPTY_PARAMS
+
+        # Try the prefix buckets this path could fall into, longest first
+        end = path.rfind('/')
+        while end >= 0:
+            key = (method, path[:end + 1])
+            end = path.rfind('/', 0, end)
+            if key not in self.dynamic_by_prefix:
                 continue
-            match = re.match(f'^{pattern}$', path)
+            combined, lookup = self.compiled.get(key) or self._compile(key)
+            match = combined.fullmatch(path)
             if match:
-                return handler, match.groupdict()
-        return None, {} 
\ No newline at end of file
+                # The route's outer group closes last, so lastindex identifies it
+                handler, params = lookup[match.lastindex]
+                return handler, {name: match.group(index) for name, index in params}
+        return None, _EMPTY_PARAMS
@@ -19,5 +19,8 @@ def init_db():
         "created_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
     })
 
+    # Give the query planner statistics for the indexes above
+    db.execute("ANALYZE")
+
 if __name__ == "__main__":
     init_db() 
\ No newline at end of file
@@ -1,3 +1,5 @@
+from datetime import datetime, timezone
+from aiohttp import web
 from . import app
 from .models import db
 
@@ -13,30 +15,40 @@ async def index(req, res):
         "docs": "https://rango-framework.readthedocs.io"
     })
 
+# Only the timestamp varies, so the rest of the body is encoded once
+_HEALTH_PREFIX = {
+    True: b'{"status":"healthy","database":"connected","timestamp":"',
+    False: b'{"status":"healthy","database":"disconnected","timestamp":"',
+}
+
 @app.route("/api/health")
 async def health_check(req, res):
     """Health check endpoint"""
-    return await res.json({
-        "status": "healthy",
-        "database": "connected" if db.is_connected() else "disconnected",
-        "timestamp": str(db.cursor.execute("SELECT datetime('now')").fetchone()[0])
-    })
+    connected = await db.run(db.is_connected)
+    timestamp = datetime.now(timezone.utc).isoformat()
+    return web.Response(
+        body=_HEALTH_PREFIX[connected] + timestamp.encode() + b'"}',
+        content_type='application/json'
+    )
 
 # User CRUD Operations
 @app.route("/api/users", methods=["GET"])
 async def get_users(req, res):
     """Get all users"""
-    users = db.query("SELECT * FROM users")
-    return await res.json({"users": users})
+    # Stream rows in batches rather than building the whole list first
+    return await res.json_stream(req, "users", db.iter_rows("SELECT * FROM users"))
 
 @app.route("/api/users/{id}", methods=["GET"])
 async def get_user(req, res):
     """Get a single user"""
-    user = db.get_one("SELECT * FROM users WHERE id = ?", (req.path_params['id'],))
+    user = await db.run(db.get_one, "SELECT * FROM users WHERE id = ?", (req.path_params['id'],))
     if not user:
         return await res.json({"error": "User not found"}, status=404)
     return await res.json({"user": user})
 
+# Fields every created user must carry
+_REQUIRED_USER_FIELDS = frozenset(('name', 'email'))
+
 @app.route("/api/users", methods=["POST"])
 async def create_user(req, res):
     """Create one or multiple users"""
@@ -47,24 +59,39 @@ async def create_user(req, res):
         if isinstance(data, list):
             # Bulk creation
             for item in data:
-                if not all(k in item for k in ('name', 'email')):
+                if not _REQUIRED_USER_FIELDS.issubset(item):
                     return await res.json({
                         "error": "Each user must have name and email"
                     }, status=400)
             
-            user_ids = db.insert('users', data)
+            last_id = await db.run(db.insert_many, 'users', data)
+            count = len(data)
+            if req.query_params.get('echo') != 'true':
+                # Echoing large batches doubles the JSON work; ?echo=true opts back in
+                return await res.json({
+                    "message": f"{count} users created successfully",
+                    "count": count
+                }, status=201)
+            if 'id' not in data[0]:
+                # Rows from one bulk insert get consecutive ids, so fetch them back in one query
+                data = await db.run(
+                    db.query,
+                    "SELECT * FROM users WHERE id BETWEEN ? AND ?",
+                    (last_id - count + 1, last_id)
+                )
             return await res.json({
-                "message": f"{len(data)} users created successfully",
+                "message": f"{count} users created successfully",
+                "count": count,
                 "users": data
             }, status=201)
         else:
             # Single creation
-            if not all(k in data for k in ('name', 'email')):
+            if not _REQUIRED_USER_FIELDS.issubset(data):
                 return await res.json({
                     "error": "Missing required fields: name, email"
                 }, status=400)
             
-            user_id = db.insert('users', data)
+            user_id = await db.run(db.insert, 'users', data)
             data['id'] = user_id
             return await res.json({
                 "message": "User created successfully",
@@ -82,16 +109,17 @@ async def update_user(req, res):
         data = await req.json()
         user_id = req.path_params['id']
         
-        # Check if user exists
-        if not db.get_one("SELECT 1 FROM users WHERE id = ?", (user_id,)):
-            return await res.json({"error": "User not found"}, status=404)
-        
-        rows_affected = db.update(
+        # A single UPDATE; no matched rows means the user doesn't exist, and the
+        # UNIQUE constraint on email rejects conflicts in the same statement
+        rows_affected = await db.run(
+            db.update,
             'users',
             data,
             "id = ?",
             (user_id,)
         )
+        if not rows_affected:
+            return await res.json({"error": "User not found"}, status=404)
         
         return await res.json({
             "message": "User updated successfully",
@@ -105,11 +133,8 @@ async def delete_user(req, res):
     """Delete a user"""
     user_id = req.path_params['id']
     
-    # Check if user exists
-    if not db.get_one("SELECT 1 FROM users WHERE id = ?", (user_id,)):
+    if not await db.run(db.delete, 'users', "id = ?", (user_id,)):
         return await res.json({"error": "User not found"}, status=404)
-    
-    db.delete('users', "id = ?", (user_id,))
     return await res.json({
         "message": "User deleted successfully"
     })
@@ -29,9 +29,14 @@ setup(
         'aiohttp>=3.8.0',
         'click>=8.0.0',
         'gunicorn>=20.1.0',
+        'orjson>=3.6.0',
         'python-dotenv>=0.19.0',
         'pytest>=6.0.0',
     ],
+    extras_require={
+        'reload': ['watchdog>=2.0.0'],
+        'speedups': ['uvloop>=0.17.0; platform_system != "Windows"'],
+    },
     entry_points={
         'console_scripts': [
             'rango=rango.cli:main',